@@ -3,18 +3,13 @@
 // than relying on the auto-generated inline-callback hash.
 window.dash_clientside = Object.assign({}, window.dash_clientside, {
     clientside: Object.assign({}, (window.dash_clientside || {}).clientside, {
-        domain_click_handler: function(n_clicks_list, current_selected, all_nodes, search_text, last_clicked) {
-            var ctx = dash_clientside.callback_context;
-            if (!ctx || !ctx.triggered || !ctx.triggered.length) {
-                throw dash_clientside.PreventUpdate;
-            }
-            if (!n_clicks_list || !n_clicks_list.some(function(n) { return n; })) {
+        // bridge_value is "domain|||timestamp", written by the delegated
+        // domain-list click listener below.
+        domain_click_handler: function(bridge_value, current_selected, all_nodes, search_text, last_clicked) {
+            if (!bridge_value || bridge_value.indexOf('|||') < 0) {
                 throw dash_clientside.PreventUpdate;
             }
-
-            var triggered = ctx.triggered[0];
-            var id_obj = JSON.parse(triggered.prop_id.split('.n_clicks')[0]);
-            var domain = id_obj.index;
+            var domain = bridge_value.split('|||')[0];
 
             var domains = (all_nodes || []).map(function(n) { return n.id; }).sort();
             if (search_text) {
@@ -41,6 +36,90 @@ window.dash_clientside = Object.assign({}, window.dash_clientside, {
             }
 
             return [domain, newSelected, domain];
+        },
+
+        // Mirror of hop_color() in force_graph_vis.py; style is the graph-style store.
+        // Copies every visible node/link: force-graph mutates what it's given
+        // (positions, link endpoints -> node objects), and these must not leak
+        // back into the graph-nodes/graph-links stores.
+        sync_graph_data: function(nodes, links, hidden_hops, hop_colors, style) {
+            nodes = nodes || [];
+            links = links || [];
+            hop_colors = hop_colors || {};
+            var hidden = new Set(hidden_hops || []);
+
+            function defaultColor(hop) {
+                if (hop === -1) return style.manual_color;
+                if (hop <= 0) return style.seed_color;
+                return style.hop_colors[(hop - 1) % style.hop_colors.length];
+            }
+
+            var visibleNodes = [];
+            var hiddenIds = new Set();
+            nodes.forEach(function(node) {
+                var hop = node.hop != null ? node.hop : 0;
+                if (hidden.has(hop)) {
+                    hiddenIds.add(node.id);
+                } else {
+                    var color = hop_colors[String(hop)] || defaultColor(hop);
+                    visibleNodes.push(Object.assign({}, node, {color: color}));
+                }
+            });
+
+            var visibleLinks = [];
+            links.forEach(function(l) {
+                if (!hiddenIds.has(l.source) && !hiddenIds.has(l.target)) {
+                    visibleLinks.push(Object.assign({}, l));
+                }
+            });
+
+            var isLarge = visibleNodes.length > style.large_node_threshold ||
+                          visibleLinks.length > style.large_edge_threshold;
+
+            // no_update preserves whatever selectedNodes the client currently has
+            return [visibleNodes, visibleLinks, isLarge ? 'performance' : 'interactive',
+                    dash_clientside.no_update];
+        },
+
+        // Left-pane domain list: sort + substring filter run in the browser so
+        // typing in the search box never round-trips to the server.
+        render_domain_list: function(all_nodes, search_text, selected_nodes) {
+            function message(text) {
+                return {
+                    namespace: 'dash_html_components',
+                    type: 'Div',
+                    props: {
+                        children: text,
+                        style: {'color': '#999', 'font-style': 'italic', 'padding': '20px', 'text-align': 'center'}
+                    }
+                };
+            }
+
+            if (!all_nodes || !all_nodes.length) {
+                return message('no domains yet. add some below.');
+            }
+
+            var domains = all_nodes.map(function(n) { return n.id; }).sort();
+            if (search_text) {
+                var q = search_text.toLowerCase();
+                domains = domains.filter(function(d) { return d.toLowerCase().indexOf(q) >= 0; });
+            }
+            if (!domains.length) {
+                return message('no matching domains.');
+            }
+
+            var selected = new Set(selected_nodes || []);
+            return domains.map(function(domain) {
+                return {
+                    namespace: 'dash_html_components',
+                    type: 'Div',
+                    props: {
+                        children: domain,
+                        'data-domain': domain,
+                        className: selected.has(domain) ? 'domain-item selected' : 'domain-item'
+                    }
+                };
+            });
         }
     })
 });
@@ -273,6 +352,13 @@ document.addEventListener('DOMContentLoaded', function() {
         document.body.style.cursor = '';
     };
 
+    // Domain list clicks: one delegated listener for every item (items carry
+    // data-domain instead of pattern-matching ids) feeding domain-click-bridge
+    document.addEventListener('click', function(e) {
+        var item = e.target.closest ? e.target.closest('.domain-item') : null;
+        if (item && item.dataset.domain) writeBridge('domain-click-bridge', item.dataset.domain);
+    });
+
     // Show on discover-btn click (event delegation — safe even if btn re-renders)
     document.addEventListener('click', function(e) {
         var t = e.target;
@@ -6,14 +6,20 @@ and building NetworkX graphs.
 """
 
 import os
+import weakref
 from pathlib import Path
-from typing import TYPE_CHECKING, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 if TYPE_CHECKING:
     import networkx as nx
     from pyccwebgraph import CCWebgraph
 
 
+# Per-webgraph memo of domain -> exists. Notebooks that build several examples
+# against one CCWebgraph then only send each domain to the JVM once.
+_validated: "weakref.WeakKeyDictionary[CCWebgraph, Dict[str, bool]]" = weakref.WeakKeyDictionary()
+
+
 def load_domains(file_path: str) -> List[str]:
     """
     Load domain names from a file (one per line).
@@ -85,6 +91,9 @@ def validate_domains(
     """
     Validate which domains exist in the webgraph.
 
+    Results are cached per webgraph instance, so only domains not seen
+    before are passed to ``validate_seeds``.
+
     Args:
         wg: Initialized CCWebgraph instance.
         domains: List of domain names to validate.
@@ -93,7 +102,18 @@ def validate_domains(
     Returns:
         Tuple of (valid_domains, missing_domains).
     """
-    valid_domains, missing = wg.validate_seeds(domains)
+    # validate_seeds reports normalized names, so memo keys must match them
+    cleaned = list(dict.fromkeys(d.strip().lower() for d in domains))
+    known = _validated.setdefault(wg, {})
+    unchecked = [d for d in cleaned if d not in known]
+    if unchecked:
+        found, _ = wg.validate_seeds(unchecked)
+        found = set(found)
+        for domain in unchecked:
+            known[domain] = domain in found
+
+    valid_domains = [d for d in cleaned if known[d]]
+    missing = [d for d in cleaned if not known[d]]
     if verbose:
         if missing:
             print(f"Note: {len(missing)} domains not found in webgraph")
@@ -114,14 +134,16 @@ def require_networkx():
 
 def print_graph_summary(G: "nx.DiGraph") -> None:
     """Print summary statistics for a network graph."""
-    seed_count = sum(1 for _, d in G.nodes(data=True) if d.get("is_seed"))
-    discovered_count = sum(1 for _, d in G.nodes(data=True) if not d.get("is_seed"))
-    internal_edges = sum(
-        1 for _, _, d in G.edges(data=True) if d.get("edge_type") == "internal"
-    )
-    external_edges = sum(
-        1 for _, _, d in G.edges(data=True) if d.get("edge_type") == "external"
-    )
+    # One pass over the nodes and one over the edges
+    seed_count = sum(1 for _, is_seed in G.nodes(data="is_seed") if is_seed)
+    discovered_count = G.number_of_nodes() - seed_count
+
+    internal_edges = external_edges = 0
+    for _, _, edge_type in G.edges(data="edge_type"):
+        if edge_type == "internal":
+            internal_edges += 1
+        elif edge_type == "external":
+            external_edges += 1
 
     print(f"\nGraph summary:")
     print(f"  Seed domains: {seed_count}")
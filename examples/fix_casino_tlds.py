@@ -8,11 +8,12 @@ and updates bad_casinos.csv with the full domain names.
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import List, Optional, Set, Tuple
 
 # Common TLDs to try, in order of preference
-TLDS_TO_TRY = [
+TLDS_TO_TRY = (
     ".com",
     ".net",
     ".org",
@@ -30,24 +31,48 @@ TLDS_TO_TRY = [
     ".cc",
     ".ag",  # Antigua - common for gambling
     ".gg",  # Common for gaming/gambling
-]
+)
+TLD_SET = frozenset(TLDS_TO_TRY)
 
 
-def find_domain_tld(wg, name: str) -> Tuple[Optional[str], List[str]]:
+def has_known_tld(name: str) -> bool:
+    """Return True if ``name`` already ends in one of TLDS_TO_TRY."""
+    _, sep, ext = name.rpartition(".")
+    return bool(sep) and "." + ext in TLD_SET
+
+
+def lookup_domains(wg, domains: List[str], max_workers: Optional[int] = None) -> Set[str]:
     """
-    Search for a domain name with various TLDs.
+    Look up many candidate domains in the webgraph concurrently.
+
+    Each ``domain_to_id`` call is a round trip to the JVM, so the lookups
+    spend most of their time waiting on I/O and overlap well across threads.
+
+    Returns:
+        Set of the candidate domains that exist in the webgraph.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as ex:
+        ids = ex.map(wg.domain_to_id, domains)
+        return {domain for domain, vid in zip(domains, ids) if vid is not None}
+
+
+def find_domain_tld(name: str, known: Set[str]) -> Tuple[Optional[str], List[str]]:
+    """
+    Pick the TLD for a bare domain name from already-resolved candidates.
+
+    Does no webgraph lookups itself: ``name + tld`` for each of
+    ``TLDS_TO_TRY`` is checked against ``known``.
+
+    Args:
+        name: Bare domain name without a TLD.
+        known: Candidate domains already confirmed to exist in the webgraph
+            (see ``lookup_domains``).
 
     Returns:
         Tuple of (preferred_domain, all_found_domains)
         preferred_domain is .com if found, otherwise first match
     """
-    found = []
-
-    for tld in TLDS_TO_TRY:
-        full_domain = name + tld
-        vid = wg.domain_to_id(full_domain)
-        if vid is not None:
-            found.append(full_domain)
+    found = [name + tld for tld in TLDS_TO_TRY if name + tld in known]
 
     if not found:
         return None, []
@@ -90,20 +115,30 @@ def main():
     multiple_found = []
 
     print("\nSearching for domains...")
-    for i, name in enumerate(names):
-        # Skip if already has a TLD (contains a dot)
+    # Resolve every candidate in one concurrent batch up front: dotted names
+    # as-is, plus every TLD for names that don't already end in a known one
+    candidates = []
+    for name in names:
         if "." in name:
-            # Verify it exists
-            vid = wg.domain_to_id(name)
-            if vid is not None:
-                results.append(name)
-                print(f"  {name} - already valid")
-            else:
-                not_found.append(name)
-                print(f"  {name} - NOT FOUND (has TLD but not in graph)")
+            candidates.append(name)
+        if not has_known_tld(name):
+            candidates.extend(name + tld for tld in TLDS_TO_TRY)
+    known = lookup_domains(wg, candidates)
+    print(f"  {len(known)}/{len(candidates)} candidate domains found in webgraph")
+
+    for name in names:
+        if name in known:
+            results.append(name)
+            print(f"  {name} - already valid")
             continue
 
-        preferred, all_found = find_domain_tld(wg, name)
+        # Skip if already has a known TLD
+        if has_known_tld(name):
+            not_found.append(name)
+            print(f"  {name} - NOT FOUND (has TLD but not in graph)")
+            continue
+
+        preferred, all_found = find_domain_tld(name, known)
 
         if preferred:
             results.append(preferred)
@@ -116,9 +151,6 @@ def main():
             not_found.append(name)
             print(f"  {name} - NOT FOUND")
 
-        if (i + 1) % 20 == 0:
-            print(f"  ... processed {i + 1}/{len(names)}")
-
     # Summary
     print(f"\n=== Summary ===")
     print(f"Found: {len(results)}")
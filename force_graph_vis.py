@@ -5,27 +5,50 @@ High-performance graph visualization using WebGL via force-graph
 
 import os
 import re
+import sqlite3
 import sys
 import base64
+import csv
 import io
 import pickle
+import threading
+import uuid
+from collections import Counter, OrderedDict
 import networkx as nx
 import dash
-from dash import html, dcc, Input, Output, State, callback_context, ALL, ClientsideFunction
+import plotly.io as pio
+from dash import html, dcc, Input, Output, State, Patch, callback_context, ALL, ClientsideFunction
 from dash.exceptions import PreventUpdate
-import json
-import xml.etree.ElementTree as ET
+import orjson
 from pathlib import Path
+from types import MappingProxyType
+from xml.sax.saxutils import XMLGenerator
 
 from dash_force_graph import ForceGraph
+from flask.json.provider import DefaultJSONProvider
 from pyccwebgraph import CCWebgraph
 
 # Add examples directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent / "examples"))
 
+# Webgraph release to load; also keys the on-disk validation cache
+WEBGRAPH_VERSION = os.environ.get("WEBGRAPH_VERSION", "cc-main-2024-feb-apr-may")
+
 # Path to precomputed example graphs
 PICKLE_DIR = Path(__file__).parent / "examples" / "pickle"
 
+# Max number of per-session graph indexes kept in memory
+MAX_GRAPH_INDEXES = 256
+
+# Max number of domain validation results kept in memory
+MAX_VALIDATED_DOMAINS = 100_000
+
+# Max number of discovery results kept in memory
+MAX_DISCOVERY_RESULTS = 32
+
+# Optional sqlite file persisting domain validation results across restarts
+VALIDATION_CACHE_PATH = os.environ.get("VALIDATION_CACHE_PATH")
+
 # Large graph thresholds (moved from JS component)
 LARGE_GRAPH_NODE_THRESHOLD = 10000
 LARGE_GRAPH_EDGE_THRESHOLD = 20000
@@ -49,7 +72,10 @@ HOP_COLORS = [
 
 
 def hop_color(hop: int) -> str:
-    """Return a color for the given hop number (1-indexed)."""
+    """Return a color for the given hop number (1-indexed).
+
+    Mirrored clientside by sync_graph_data in assets/context_menu.js.
+    """
     if hop == -1:
         return MANUAL_COLOR
     if hop <= 0:
@@ -63,12 +89,33 @@ def _eye_icon(visible: bool) -> "html.I":
     return html.I(className=cls, style={'font-size': '13px', 'color': color, 'pointer-events': 'none'})
 
 
-# Regex for a well-formed domain
-DOMAIN_RE = re.compile(
-    r'^(?!-)'
+# Regex for a well-formed domain. Labels can't start with '-' by construction,
+# so no lookaround is needed and the pattern also compiles under RE2.
+DOMAIN_PATTERN = (
     r'(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)'
-    r'+[a-zA-Z]{2,}$'
+    r'+[a-zA-Z]{2,}'
 )
+DOMAIN_RE = re.compile(f'^{DOMAIN_PATTERN}$')
+
+# Same pattern applied per line, so a whole pasted list is validated in one
+# scan. Uses RE2's linear-time engine when google-re2 is installed.
+try:
+    import re2 as _bulk_re
+except ImportError:
+    _bulk_re = re
+DOMAIN_LINES_RE = _bulk_re.compile(f'(?m)^{DOMAIN_PATTERN}$')
+
+# Pattern-matching prop_ids have a fixed shape, e.g.
+# '{"index":"0,2","type":"legend-eye"}.n_clicks'
+_INDEX_RE = re.compile(r'"index":"([^"\\]*)"')
+
+
+def _triggered_index(prop_id: str) -> str:
+    """Extract the ``index`` of a pattern-matching component from its prop_id."""
+    m = _INDEX_RE.search(prop_id)
+    if m:
+        return m.group(1)
+    return str(orjson.loads(prop_id.rsplit('.', 1)[0])['index'])
 
 
 class GraphExplorer:
@@ -77,29 +124,73 @@ class GraphExplorer:
     def __init__(self, webgraph):
         self.webgraph = webgraph
         self.hop_counter = 0
+        # (seed set, direction) -> (min_connections, DiscoveryResult), LRU order
+        self._results = OrderedDict()
+        self._results_lock = threading.Lock()
 
     def discover_neighbors(self, seed_domains, min_connections=5, direction='backlinks'):
-        """Query Common Crawl for neighbors of seed domains."""
-        result = self.webgraph.discover(
-            seed_domains=seed_domains,
-            min_connections=min_connections,
-            direction=direction
-        )
-        nodes, links = self._build_elements(seed_domains, result)
+        """Query Common Crawl for neighbors of seed domains.
+
+        Results are cached per seed set and direction, keeping the run with
+        the lowest min_connections seen so far. Re-running a discovery (e.g.
+        from another session) or raising the threshold is answered by
+        filtering that run instead of going back to the JVM.
+        """
+        key = (frozenset(seed_domains), direction)
+        with self._results_lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+
+        if cached is not None and cached[0] <= min_connections:
+            cached_min, result = cached
+            result_nodes, result_edges = result.nodes, result.edges
+            if min_connections > cached_min:
+                result_nodes, result_edges = self._filter_result(
+                    key[0], result_nodes, result_edges, min_connections)
+        else:
+            result = self.webgraph.discover(
+                seed_domains=seed_domains,
+                min_connections=min_connections,
+                direction=direction
+            )
+            with self._results_lock:
+                self._results[key] = (min_connections, result)
+                self._results.move_to_end(key)
+                while len(self._results) > MAX_DISCOVERY_RESULTS:
+                    self._results.popitem(last=False)
+            result_nodes, result_edges = result.nodes, result.edges
+
+        nodes, links = self._build_elements(result_nodes, result_edges)
         return nodes, links
 
-    def _build_elements(self, _seed_domains, result):
-        """Convert DiscoveryResult to nodes and links"""
+    @staticmethod
+    def _filter_result(seeds, result_nodes, result_edges, min_connections):
+        """Narrow a lower-threshold result to the nodes linked with >= min_connections seeds."""
+        seed_links = Counter()
+        for src, tgt in result_edges:
+            if src in seeds:
+                seed_links[tgt] += 1
+            if tgt in seeds:
+                seed_links[src] += 1
+        kept = {n['domain'] for n in result_nodes
+                if n['domain'] in seeds or seed_links[n['domain']] >= min_connections}
+        nodes = [n for n in result_nodes if n['domain'] in kept]
+        edges = [(src, tgt) for src, tgt in result_edges
+                 if (src in kept or src in seeds) and (tgt in kept or tgt in seeds)]
+        return nodes, edges
+
+    def _build_elements(self, result_nodes, result_edges):
+        """Convert DiscoveryResult nodes and edges to graph nodes and links"""
         nodes = []
         links = []
 
-        if result.nodes:
+        if result_nodes:
             # Count in-degree for each node from the edges
-            in_degree = {}
-            for src, tgt in result.edges:
-                in_degree[tgt] = in_degree.get(tgt, 0) + 1
+            in_degree = Counter(tgt for _, tgt in result_edges)
+            hop = self.hop_counter + 1
 
-            for node_data in result.nodes:
+            for node_data in result_nodes:
                 domain = node_data['domain']
                 # Use in-degree as connections (how many edges point to this node)
                 connections = in_degree.get(domain, 0)
@@ -108,11 +199,11 @@ class GraphExplorer:
                     'id': domain,
                     'label': domain,
                     'type': 'discovered',
-                    'hop': self.hop_counter + 1,
+                    'hop': hop,
                     'connections': connections
                 })
 
-            for src, tgt in result.edges:
+            for src, tgt in result_edges:
                 links.append({
                     'source': src,
                     'target': tgt
@@ -121,13 +212,125 @@ class GraphExplorer:
         return nodes, links
 
 
+class GraphIndex:
+    """Node-id and edge-key sets for one session's graph stores.
+
+    Cached across callbacks so discover/add only pay for the new nodes and
+    links instead of rebuilding both sets from the full stores every click.
+    """
+
+    def __init__(self, nodes, links):
+        # Intern ids: the client JSON decodes a fresh copy of a domain for
+        # every link it appears in, but the index only needs to hold one
+        intern = sys.intern
+        self.node_ids = {intern(n['id']) for n in nodes}
+        self.edge_keys = {(intern(l['source']), intern(l['target'])) for l in links}
+        self._adjacency = None
+
+    def matches(self, nodes, links):
+        """Cheap staleness check against the stores sent by the client."""
+        return len(self.node_ids) == len(nodes) and len(self.edge_keys) == len(links)
+
+    @property
+    def adjacency(self):
+        """node id -> keys of the edges touching it, so deletes don't scan all links.
+
+        Built on first use: only deletes need it, so add/discover never pay for it.
+        """
+        if self._adjacency is None:
+            adjacency = {}
+            for key in self.edge_keys:
+                src, tgt = key
+                adjacency.setdefault(src, set()).add(key)
+                adjacency.setdefault(tgt, set()).add(key)
+            self._adjacency = adjacency
+        return self._adjacency
+
+    def add_edge(self, key):
+        src, tgt = sys.intern(key[0]), sys.intern(key[1])
+        key = (src, tgt)
+        self.edge_keys.add(key)
+        if self._adjacency is not None:
+            self._adjacency.setdefault(src, set()).add(key)
+            self._adjacency.setdefault(tgt, set()).add(key)
+
+    def add_nodes(self, nodes):
+        """Record nodes not already in the graph and return just those."""
+        added = []
+        for node in nodes:
+            if node['id'] not in self.node_ids:
+                self.node_ids.add(sys.intern(node['id']))
+                added.append(node)
+        return added
+
+    def add_links(self, links):
+        """Record links not already in the graph and return just those."""
+        added = []
+        for link in links:
+            key = (link['source'], link['target'])
+            if key not in self.edge_keys:
+                self.add_edge(key)
+                added.append(link)
+        return added
+
+    def remove_nodes(self, node_ids):
+        """Drop nodes and their incident edges; return the removed edge keys."""
+        removed = set()
+        for node_id in node_ids:
+            self.node_ids.discard(node_id)
+            removed |= self.adjacency.pop(node_id, set())
+        for key in removed:
+            self.edge_keys.discard(key)
+            for endpoint in key:
+                incident = self.adjacency.get(endpoint)
+                if incident is not None:
+                    incident.discard(key)
+        return removed
+
+
+_graph_indexes = OrderedDict()
+_graph_indexes_lock = threading.Lock()
+
+
+def get_graph_index(session_id, nodes, links):
+    """Return the cached GraphIndex for a session, rebuilding it if missing or stale."""
+    with _graph_indexes_lock:
+        index = _graph_indexes.get(session_id) if session_id else None
+        if index is None or not index.matches(nodes, links):
+            index = GraphIndex(nodes, links)
+        if session_id:
+            _graph_indexes[session_id] = index
+            _graph_indexes.move_to_end(session_id)
+            while len(_graph_indexes) > MAX_GRAPH_INDEXES:
+                _graph_indexes.popitem(last=False)
+        return index
+
+
+def drop_graph_index(session_id):
+    """Forget a session's index, e.g. when its graph is replaced wholesale."""
+    with _graph_indexes_lock:
+        _graph_indexes.pop(session_id, None)
+
+
+def append_patch(items):
+    """Patch that appends items to a list store, or no_update if there are none.
+
+    Lets add/discover callbacks send only the new nodes/links back to the
+    client instead of re-serializing the whole graph.
+    """
+    if not items:
+        return dash.no_update
+    patch = Patch()
+    patch.extend(items)
+    return patch
+
+
 def get_webgraph():
     """Initialize CCWebgraph from environment variables."""
     webgraph_dir = os.environ.get("WEBGRAPH_DIR", "/data/webgraph")
-    version = os.environ.get("WEBGRAPH_VERSION", "cc-main-2024-feb-apr-may")
     jar_path = os.environ.get("CC_WEBGRAPH_JAR", None)
 
-    wg = CCWebgraph(webgraph_dir, version, jar_path)
+    wg = CCWebgraph(webgraph_dir, WEBGRAPH_VERSION, jar_path)
     wg.load_graph()
     return wg
 
@@ -136,6 +339,92 @@ def get_webgraph():
 webgraph = get_webgraph()
 explorer = GraphExplorer(webgraph=webgraph)
 
+# domain -> whether it exists in the webgraph, shared across sessions
+_validated_domains = OrderedDict()
+_validated_domains_lock = threading.Lock()
+
+
+def open_validation_db(path):
+    """Open (creating if needed) the sqlite file backing the validation memo."""
+    db = sqlite3.connect(path, check_same_thread=False)
+    db.execute('PRAGMA journal_mode=WAL')
+    db.execute('PRAGMA synchronous=NORMAL')
+    db.execute(
+        'CREATE TABLE IF NOT EXISTS validated ('
+        'version TEXT, domain TEXT, found INTEGER, PRIMARY KEY (version, domain)'
+        ') WITHOUT ROWID'
+    )
+    return db
+
+
+_validation_db = open_validation_db(VALIDATION_CACHE_PATH) if VALIDATION_CACHE_PATH else None
+_validation_db_lock = threading.Lock()
+
+
+def _load_persisted_validations(domains):
+    """Return {domain: found} for the domains already in the on-disk cache."""
+    if _validation_db is None:
+        return {}
+    results = {}
+    with _validation_db_lock:
+        for i in range(0, len(domains), 500):
+            chunk = domains[i:i + 500]
+            rows = _validation_db.execute(
+                'SELECT domain, found FROM validated '
+                f'WHERE version = ? AND domain IN ({",".join("?" * len(chunk))})',
+                [WEBGRAPH_VERSION, *chunk],
+            )
+            results.update((domain, bool(found)) for domain, found in rows)
+    return results
+
+
+def _persist_validations(results):
+    if _validation_db is None or not results:
+        return
+    with _validation_db_lock, _validation_db:
+        _validation_db.executemany(
+            'INSERT OR REPLACE INTO validated VALUES (?, ?, ?)',
+            [(WEBGRAPH_VERSION, domain, int(found)) for domain, found in results.items()],
+        )
+
+
+def validate_domains(domains):
+    """Return the domains present in the webgraph, deduplicated in input order.
+
+    Results are memoized per domain, so repeated pastes only send domains
+    that haven't been checked before, in a single validate_seeds batch.
+    With VALIDATION_CACHE_PATH set, the memo is also kept on disk so it
+    survives restarts.
+    """
+    domains = list(dict.fromkeys(domains))
+    with _validated_domains_lock:
+        known = {d: _validated_domains[d] for d in domains if d in _validated_domains}
+        for domain in known:
+            _validated_domains.move_to_end(domain)
+
+    unknown = [d for d in domains if d not in known]
+    if unknown:
+        results = _load_persisted_validations(unknown)
+        unchecked = [d for d in unknown if d not in results]
+        if unchecked:
+            found, _ = webgraph.validate_seeds(unchecked)
+            found = set(found)
+            fresh = {d: d in found for d in unchecked}
+            _persist_validations(fresh)
+            results.update(fresh)
+        with _validated_domains_lock:
+            for domain, exists in results.items():
+                known[domain] = _validated_domains[domain] = exists
+            while len(_validated_domains) > MAX_VALIDATED_DOMAINS:
+                _validated_domains.popitem(last=False)
+
+    return [d for d in domains if known[d]]
+
+
+# Dash serializes callback payloads through plotly's JSON encoder; pin it to
+# orjson so large node/link lists are encoded in C rather than stdlib json
+pio.json.config.default_engine = 'orjson'
+
 # Initialize Dash app
 app = dash.Dash(
     __name__,
@@ -145,8 +434,26 @@ app = dash.Dash(
     external_stylesheets=['https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.0/css/all.min.css'],
 )
 
-# URL to example type mapping
-EXAMPLE_MAP = {
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    Dash parses every callback request body (including the full graph-nodes
+    and graph-links State) with the Flask provider, so this moves that
+    decode off the stdlib json module.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+app.server.json = OrjsonProvider(app.server)
+
+# URL to example type mapping (read-only; also drives the server routes below)
+EXAMPLE_MAP = MappingProxyType({
     '/link-spam-network': 'link-spam',
     '/high-profile-news-network': 'news-polarization',
     '/iranian-news-network': 'iranian',
@@ -154,7 +461,7 @@ EXAMPLE_MAP = {
     '/think-tanks': 'think-tanks',
     '/news-credibility-network': 'news-credibility',
     '/dotnews-network': 'dotnews',
-}
+})
 EXAMPLE_NAMES = {
     'link-spam': 'Link Spam Network',
     'news-polarization': 'News Polarization Network',
@@ -187,6 +494,95 @@ pickle_files = {
     'dotnews': 'dotnews_network.pkl',
 }
 
+# example_type -> (nodes, links, legend_labels, initial_hidden_hops), built
+# lazily from the pickles on first request and shared across sessions
+_example_cache = {}
+_example_cache_lock = threading.Lock()
+
+
+def _build_example_graph(example_type):
+    """Unpickle an example graph and convert it to nodes/links store data."""
+    pickle_path = PICKLE_DIR / pickle_files[example_type]
+    with open(pickle_path, 'rb') as f:
+        G = pickle.load(f)
+
+    # Prune isolates (nodes with no edges) before converting
+    isolates = list(nx.isolates(G))
+    G.remove_nodes_from(isolates)
+
+    node_items = list(G.nodes(data=True))
+    node_types = [
+        data.get('node_type', 'seed' if data.get('is_seed') else 'discovered')
+        for _, data in node_items
+    ]
+
+    # node_type → hop mapping, in first-seen order
+    type_to_hop = {ntype: hop for hop, ntype in enumerate(dict.fromkeys(node_types))}
+    legend_labels = {str(hop): ntype for ntype, hop in type_to_hop.items()}
+
+    # Degrees read straight off the adjacency dicts (O(1) per node), and only
+    # for nodes without a stored connection count
+    pred = G.pred
+    succ = G.succ
+    connections = [
+        data['total_connections'] if 'total_connections' in data
+        else data['connections'] if 'connections' in data
+        else len(pred[node]) if data.get('is_seed')
+        else len(succ[node])
+        for node, data in node_items
+    ]
+
+    # Convert NetworkX to nodes/links
+    nodes = [
+        {'id': node, 'label': node, 'type': ntype, 'hop': type_to_hop[ntype], 'connections': conn}
+        for (node, _), ntype, conn in zip(node_items, node_types, connections)
+    ]
+    links = [{'source': src, 'target': tgt} for src, tgt in G.edges()]
+
+    # Compute default hidden hops from per-example config
+    default_hidden_labels = {
+        s.lower() for s in EXAMPLE_DEFAULT_HIDDEN_LABELS.get(example_type, set())
+    }
+    initial_hidden_hops = [
+        hop for ntype, hop in type_to_hop.items()
+        if ntype.lower() in default_hidden_labels
+    ]
+
+    return nodes, links, legend_labels, initial_hidden_hops
+
+
+def get_example_graph(example_type):
+    """Return the converted example graph, unpickling it only on first use."""
+    with _example_cache_lock:
+        cached = _example_cache.get(example_type)
+    if cached is None:
+        cached = _build_example_graph(example_type)
+        with _example_cache_lock:
+            cached = _example_cache.setdefault(example_type, cached)
+    return cached
+
+
+def warm_up(sample_size=50):
+    """Pre-build the example graphs and exercise the webgraph lookups once.
+
+    Run in a background thread at startup so the first user query doesn't
+    pay for unpickling or for the JVM's still-cold lookup paths.
+    """
+    for example_type in pickle_files:
+        try:
+            nodes, _, _, _ = get_example_graph(example_type)
+        except Exception as e:
+            print(f"Warm-up: could not load example {example_type}: {e}")
+            continue
+        sample = [n['id'] for n in nodes[:sample_size]]
+        if sample:
+            try:
+                webgraph.validate_seeds(sample)
+                webgraph.get_links_between(domains_from=sample, domains_to=sample)
+            except Exception as e:
+                print(f"Warm-up: webgraph query failed: {e}")
+
+
 # ----- Layout -----
 app.layout = html.Div([
     # ===== Navbar =====
@@ -490,6 +886,10 @@ app.layout = html.Div([
 
     # Hidden stores
     dcc.Location(id='url', refresh=False),
+    # Per-page-load id keying server-side caches (see get_graph_index).
+    # Kept in memory like the graph stores: sessionStorage is copied when a
+    # tab is duplicated, which would let two graphs share one index
+    dcc.Store(id='session-id'),
     dcc.Store(id='graph-nodes', data=[]),
     dcc.Store(id='graph-links', data=[]),
     dcc.Store(id='focus-domain', data=None),
@@ -500,9 +900,20 @@ app.layout = html.Div([
     dcc.Store(id='hidden-hops', data=[]),
     dcc.Store(id='hop-colors', data={}),
     dcc.Store(id='presenter-mode', data=False),
+    # Palette and size thresholds read by the clientside sync_graph_data
+    dcc.Store(id='graph-style', data={
+        'seed_color': SEED_COLOR,
+        'manual_color': MANUAL_COLOR,
+        'hop_colors': HOP_COLORS,
+        'large_node_threshold': LARGE_GRAPH_NODE_THRESHOLD,
+        'large_edge_threshold': LARGE_GRAPH_EDGE_THRESHOLD,
+    }),
     # Off-screen bridge: JS writes "hop|||#color|||timestamp" here to trigger color callback
     dcc.Input(id='color-pick-bridge', type='text', value='', debounce=False,
               style={'position': 'fixed', 'top': '-200px', 'opacity': '0', 'pointer-events': 'none'}),
+    # Off-screen bridge: domain-list clicks write "domain|||timestamp" here
+    dcc.Input(id='domain-click-bridge', type='text', value='', debounce=False,
+              style={'position': 'fixed', 'top': '-200px', 'opacity': '0', 'pointer-events': 'none'}),
     # Off-screen bridges for presenter search
     # select: "nodeId|||timestamp" or "nodeId|||hop|||timestamp" (3 parts = unhide hop first)
     dcc.Input(id='presenter-select-bridge', type='text', value='', debounce=False,
@@ -537,8 +948,10 @@ app.layout = html.Div([
 
 # ----- Callbacks -----
 
-# Sync nodes/links stores to ForceGraph component
-@app.callback(
+# Sync nodes/links stores to ForceGraph component (colors, hidden hops and
+# render mode are applied in the browser, so the graph never round-trips)
+app.clientside_callback(
+    ClientsideFunction(namespace='clientside', function_name='sync_graph_data'),
     [Output('force-graph', 'nodes'),
      Output('force-graph', 'links'),
      Output('force-graph', 'mode'),
@@ -547,38 +960,21 @@ app.layout = html.Div([
      Input('graph-links', 'data'),
      Input('hidden-hops', 'data'),
      Input('hop-colors', 'data')],
+    State('graph-style', 'data'),
     prevent_initial_call=True
 )
-def sync_graph_data(nodes, links, hidden_hops, hop_colors):
-    nodes = nodes or []
-    links = links or []
-    hidden_set = set(hidden_hops or [])
-    hop_colors = hop_colors or {}
 
-    # Set colors (custom override or palette default) and filter hidden hops
-    visible_nodes = []
-    hidden_ids = set()
-    for node in nodes:
-        hop = node.get('hop', 0)
-        color = hop_colors.get(str(hop)) or hop_color(hop)
-        node = {**node, 'color': color}
-        if hop in hidden_set:
-            hidden_ids.add(node['id'])
-        else:
-            visible_nodes.append(node)
-
-    visible_links = [
-        l for l in links
-        if l['source'] not in hidden_ids and l['target'] not in hidden_ids
-    ]
 
-    # Determine mode based on visible graph size
-    is_large = (len(visible_nodes) > LARGE_GRAPH_NODE_THRESHOLD or
-                len(visible_links) > LARGE_GRAPH_EDGE_THRESHOLD)
-    mode = 'performance' if is_large else 'interactive'
-
-    # no_update preserves whatever selectedNodes the client currently has
-    return visible_nodes, visible_links, mode, dash.no_update
+# Assign a fresh session id on every page load
+@app.callback(
+    Output('session-id', 'data'),
+    Input('url', 'pathname'),
+    State('session-id', 'data'),
+)
+def init_session_id(_pathname, session_id):
+    if session_id:
+        raise PreventUpdate
+    return uuid.uuid4().hex
 
 
 # Presenter mode: toggle store on button click
@@ -719,10 +1115,11 @@ def presenter_select_node(bridge_value, hidden_hops):
     Input('presenter-add-bridge', 'value'),
     [State('graph-nodes', 'data'),
      State('graph-links', 'data'),
-     State('legend-labels', 'data')],
+     State('legend-labels', 'data'),
+     State('session-id', 'data')],
     prevent_initial_call=True,
 )
-def presenter_add_domain(bridge_value, current_nodes, current_links, legend_labels):
+def presenter_add_domain(bridge_value, current_nodes, current_links, legend_labels, session_id):
     if not bridge_value or '|||' not in bridge_value:
         raise PreventUpdate
     parts = bridge_value.split('|||')
@@ -732,35 +1129,32 @@ def presenter_add_domain(bridge_value, current_nodes, current_links, legend_labe
     if not DOMAIN_RE.match(domain):
         return dash.no_update, dash.no_update, dash.no_update, dash.no_update, f'invalid|||{domain}|||{ts}'
 
-    in_cc, _ = webgraph.validate_seeds([domain])
-    if not in_cc:
+    if not validate_domains([domain]):
         return dash.no_update, dash.no_update, dash.no_update, dash.no_update, f'not_found|||{domain}|||{ts}'
 
-    current_nodes = list(current_nodes or [])
-    current_links = list(current_links or [])
+    current_nodes = current_nodes or []
+    current_links = current_links or []
     legend_labels = dict(legend_labels or {})
-    existing_ids = {n['id'] for n in current_nodes}
+    index = get_graph_index(session_id, current_nodes, current_links)
+    added_nodes = []
 
-    if domain not in existing_ids:
+    if domain not in index.node_ids:
         # Pick the next hop number above the highest one already in the graph.
         # Using max-from-nodes (not explorer.hop_counter) avoids collisions when
         # an example loaded its own hop assignments without touching the counter.
         existing_hops = {n.get('hop', 0) for n in current_nodes}
         new_hop = max(existing_hops | {0}) + 1
-        current_nodes.append({'id': domain, 'label': domain, 'type': 'manual', 'hop': new_hop, 'connections': 0})
-        existing_ids.add(domain)
+        added_nodes = index.add_nodes(
+            [{'id': domain, 'label': domain, 'type': 'manual', 'hop': new_hop, 'connections': 0}])
         legend_labels[str(new_hop)] = domain
 
     # Find all edges between the new domain and every node already in the graph
-    all_ids = list(existing_ids)
+    all_ids = list(index.node_ids)
     new_edges = webgraph.get_links_between(domains_from=all_ids, domains_to=all_ids)
-    existing_link_set = {(l['source'], l['target']) for l in current_links}
-    for src, tgt in new_edges:
-        if (src, tgt) not in existing_link_set:
-            current_links.append({'source': src, 'target': tgt})
-            existing_link_set.add((src, tgt))
+    added_links = index.add_links({'source': src, 'target': tgt} for src, tgt in new_edges)
 
-    return current_nodes, current_links, [domain], legend_labels, f'ok|||{domain}|||{ts}'
+    return (append_patch(added_nodes), append_patch(added_links), [domain],
+            legend_labels, f'ok|||{domain}|||{ts}')
 
 
 # Legend: rebuild whenever nodes, stored labels, or hidden-hops change
@@ -879,7 +1273,7 @@ def legend_select_hop(n_clicks_list, nodes):
     if not ctx.triggered or not any(n_clicks_list):
         raise PreventUpdate
     prop_id = ctx.triggered[0]['prop_id']
-    index_str = str(json.loads(prop_id.rsplit('.', 1)[0])['index'])
+    index_str = _triggered_index(prop_id)
     hops = {int(h) for h in index_str.split(',')}
     nodes = nodes or []
     return [n['id'] for n in nodes if n.get('hop', 0) in hops]
@@ -897,7 +1291,7 @@ def toggle_hop_visibility(n_clicks_list, hidden_hops):
     if not ctx.triggered or not any(n_clicks_list):
         raise PreventUpdate
     prop_id = ctx.triggered[0]['prop_id']
-    index_str = str(json.loads(prop_id.rsplit('.', 1)[0])['index'])
+    index_str = _triggered_index(prop_id)
     hops = [int(h) for h in index_str.split(',')]
     hidden_set = set(hidden_hops or [])
     all_hidden = all(h in hidden_set for h in hops)
@@ -948,7 +1342,7 @@ def save_legend_label(values, current_labels, hop_colors, nodes):
     current_labels = dict(current_labels or {})
     hop_colors = dict(hop_colors or {})
     prop_id = ctx.triggered[0]['prop_id']
-    index_str = str(json.loads(prop_id.rsplit('.', 1)[0])['index'])
+    index_str = _triggered_index(prop_id)
     hops = [int(h) for h in index_str.split(',')]
     value = ctx.triggered[0]['value']
     if value is None:
@@ -983,42 +1377,14 @@ def save_legend_label(values, current_labels, hop_colors, nodes):
     return current_labels, hop_colors
 
 
-# Update domain list from nodes
-@app.callback(
+# Update domain list from nodes (clientside: filtering runs on every keystroke)
+app.clientside_callback(
+    ClientsideFunction(namespace='clientside', function_name='render_domain_list'),
     Output('domain-list-container', 'children'),
     [Input('graph-nodes', 'data'),
      Input('domain-search', 'value'),
      Input('force-graph', 'selectedNodes')]
 )
-def update_domain_list(nodes, search_text, selected_nodes):
-    if not nodes:
-        return html.Div(
-            "no domains yet. add some below.",
-            style={'color': '#999', 'font-style': 'italic', 'padding': '20px', 'text-align': 'center'}
-        )
-
-    domains = sorted([n['id'] for n in nodes])
-
-    if search_text:
-        query = search_text.lower()
-        domains = [d for d in domains if query in d.lower()]
-
-    if not domains:
-        return html.Div(
-            "no matching domains.",
-            style={'color': '#999', 'font-style': 'italic', 'padding': '20px', 'text-align': 'center'}
-        )
-
-    selected_set = set(selected_nodes or [])
-    return [
-        html.Div(
-            domain,
-            id={'type': 'domain-item', 'index': domain},
-            className='domain-item selected' if domain in selected_set else 'domain-item',
-            n_clicks=0
-        )
-        for domain in domains
-    ]
 
 
 # Domain click -> multi-select with Ctrl/Shift, center on clicked node
@@ -1027,7 +1393,7 @@ app.clientside_callback(
     [Output('force-graph', 'centerAt'),
      Output('force-graph', 'selectedNodes', allow_duplicate=True),
      Output('last-clicked-domain', 'data')],
-    Input({'type': 'domain-item', 'index': ALL}, 'n_clicks'),
+    Input('domain-click-bridge', 'value'),
     [State('force-graph', 'selectedNodes'),
      State('graph-nodes', 'data'),
      State('domain-search', 'value'),
@@ -1062,13 +1428,15 @@ app.clientside_callback(
 
 
 # Selection count display
-@app.callback(
+app.clientside_callback(
+    """
+    function(selected) {
+        return (selected ? selected.length : 0) + ' selected';
+    }
+    """,
     Output('selection-count', 'children'),
     Input('force-graph', 'selectedNodes')
 )
-def update_selection_count(selected):
-    count = len(selected) if selected else 0
-    return f"{count} selected"
 
 
 # Import file + Add to viewport
@@ -1083,10 +1451,11 @@ def update_selection_count(selected):
     [State('file-upload', 'filename'),
      State('new-domains-input', 'value'),
      State('graph-nodes', 'data'),
-     State('graph-links', 'data')],
+     State('graph-links', 'data'),
+     State('session-id', 'data')],
     prevent_initial_call=True
 )
-def import_and_add(file_contents, add_clicks, filename, textarea_value, current_nodes, current_links):
+def import_and_add(file_contents, add_clicks, filename, textarea_value, current_nodes, current_links, session_id):
     ctx = callback_context
     if not ctx.triggered:
         raise PreventUpdate
@@ -1099,38 +1468,33 @@ def import_and_add(file_contents, add_clicks, filename, textarea_value, current_
     if trigger == 'file-upload' and file_contents:
         _, content_string = file_contents.split(',')
         decoded = base64.b64decode(content_string).decode('utf-8')
-        return current_nodes, current_links, decoded, *no_report
+        return dash.no_update, dash.no_update, decoded, *no_report
 
     if trigger == 'add-viewport-btn':
         if not textarea_value or not textarea_value.strip():
             raise PreventUpdate
 
-        raw_domains = [d.strip() for d in textarea_value.split('\n') if d.strip()]
+        # Deduplicate up front (keeping paste order) so the report counts
+        # below all refer to the same distinct domains as validate_domains
+        raw_domains = list(dict.fromkeys(
+            d.strip().lower() for d in textarea_value.split('\n') if d.strip()
+        ))
         if not raw_domains:
             raise PreventUpdate
 
         total_input = len(raw_domains)
-        well_formed = [d for d in raw_domains if DOMAIN_RE.match(d)]
-
-        if well_formed:
-            in_cc, _ = webgraph.validate_seeds(well_formed)
-        else:
-            in_cc = []
+        well_formed = list(dict.fromkeys(DOMAIN_LINES_RE.findall('\n'.join(raw_domains))))
 
-        existing_ids = {n['id'] for n in current_nodes}
-        added = []
+        in_cc = validate_domains(well_formed) if well_formed else []
 
-        for domain in in_cc:
-            if domain not in existing_ids:
-                current_nodes.append({
-                    'id': domain,
-                    'label': domain,
-                    'type': 'manual',
-                    'hop': -1,
-                    'connections': 0
-                })
-                existing_ids.add(domain)
-                added.append(domain)
+        index = get_graph_index(session_id, current_nodes, current_links)
+        added = index.add_nodes({
+            'id': domain,
+            'label': domain,
+            'type': 'manual',
+            'hop': -1,
+            'connections': 0
+        } for domain in in_cc)
 
         n_well_formed = len(well_formed)
         n_in_cc = len(in_cc)
@@ -1143,9 +1507,9 @@ def import_and_add(file_contents, add_clicks, filename, textarea_value, current_
                 f"  - {n_in_cc} found in commoncrawl data\n"
                 f"  - {n_added} imported to viewport"
             )
-            return current_nodes, current_links, '', True, msg
+            return append_patch(added), dash.no_update, '', True, msg
 
-        return current_nodes, current_links, '', *no_report
+        return append_patch(added), dash.no_update, '', *no_report
 
     raise PreventUpdate
 
@@ -1160,10 +1524,14 @@ def import_and_add(file_contents, add_clicks, filename, textarea_value, current_
      State('direction-radio', 'value'),
      State('min-conn-input', 'value'),
      State('graph-nodes', 'data'),
-     State('graph-links', 'data')],
+     State('graph-links', 'data'),
+     State('session-id', 'data')],
+    # Disable the button while a discovery is in flight so repeat clicks
+    # don't queue more blocking webgraph.discover calls behind it
+    running=[(Output('discover-btn', 'disabled'), True, False)],
     prevent_initial_call=True
 )
-def discover_neighbors(n_clicks, selected_nodes, direction, min_conn, current_nodes, current_links):
+def discover_neighbors(n_clicks, selected_nodes, direction, min_conn, current_nodes, current_links, session_id):
     if not n_clicks or not selected_nodes:
         raise PreventUpdate
 
@@ -1176,27 +1544,17 @@ def discover_neighbors(n_clicks, selected_nodes, direction, min_conn, current_no
 
     new_nodes, new_links = explorer.discover_neighbors(selected_nodes, min_conn, direction)
 
-    existing_ids = {n['id'] for n in current_nodes}
-    added_any = False
-    for node in new_nodes:
-        if node['id'] not in existing_ids:
-            current_nodes.append(node)
-            existing_ids.add(node['id'])
-            added_any = True
+    index = get_graph_index(session_id, current_nodes, current_links)
+    added_nodes = index.add_nodes(new_nodes)
 
-    if added_any:
+    if added_nodes:
         explorer.hop_counter += 1
 
     # Add new links (avoid duplicates)
-    existing_links = {(l['source'], l['target']) for l in current_links}
-    for link in new_links:
-        key = (link['source'], link['target'])
-        if key not in existing_links:
-            current_links.append(link)
-            existing_links.add(key)
+    added_links = index.add_links(new_links)
 
     # Re-output the seed selection so it survives the graph update
-    return current_nodes, current_links, selected_nodes
+    return append_patch(added_nodes), append_patch(added_links), selected_nodes
 
 
 # Delete selected nodes
@@ -1207,10 +1565,11 @@ def discover_neighbors(n_clicks, selected_nodes, direction, min_conn, current_no
     Input('delete-btn', 'n_clicks'),
     [State('force-graph', 'selectedNodes'),
      State('graph-nodes', 'data'),
-     State('graph-links', 'data')],
+     State('graph-links', 'data'),
+     State('session-id', 'data')],
     prevent_initial_call=True
 )
-def delete_selected(n_clicks, selected_nodes, current_nodes, current_links):
+def delete_selected(n_clicks, selected_nodes, current_nodes, current_links, session_id):
     if not n_clicks or not selected_nodes:
         raise PreventUpdate
 
@@ -1218,14 +1577,18 @@ def delete_selected(n_clicks, selected_nodes, current_nodes, current_links):
     current_nodes = current_nodes or []
     current_links = current_links or []
 
+    # Edges to drop come from the adjacency index, not a scan of every link
+    index = get_graph_index(session_id, current_nodes, current_links)
+    removed_edges = index.remove_nodes(selected_set)
+
     # Remove selected nodes
     new_nodes = [n for n in current_nodes if n['id'] not in selected_set]
 
-    # Remove links connected to deleted nodes
-    new_links = [
-        l for l in current_links
-        if l['source'] not in selected_set and l['target'] not in selected_set
-    ]
+    # Remove links connected to deleted nodes (untouched if none were)
+    if removed_edges:
+        new_links = [l for l in current_links if (l['source'], l['target']) not in removed_edges]
+    else:
+        new_links = dash.no_update
 
     return new_nodes, new_links, []
 
@@ -1244,9 +1607,7 @@ def export_graph(n_clicks_list, nodes, links, legend_labels):
     if not ctx.triggered or not any(n_clicks_list):
         raise PreventUpdate
 
-    prop_id = ctx.triggered[0]['prop_id']
-    clicked_id = json.loads(prop_id.rsplit('.', 1)[0])
-    fmt = clicked_id['index']
+    fmt = _triggered_index(ctx.triggered[0]['prop_id'])
 
     nodes = nodes or []
     links = links or []
@@ -1260,45 +1621,66 @@ def export_graph(n_clicks_list, nodes, links, legend_labels):
         return legend_labels.get(str(hop), default)
 
     if fmt == 'csv-nodes':
-        lines = ['domain,type,hop,hop_label,connections']
-        for n in nodes:
+        buf = io.StringIO()
+        w = csv.writer(buf, lineterminator='\n')
+        w.writerow(['domain', 'type', 'hop', 'hop_label', 'connections'])
+
+        def node_row(n):
             hop = n.get('hop', 0)
-            lines.append(f"{n['id']},{n.get('type','')},{hop},{hop_label(hop)},{n.get('connections','')}")
-        return dict(content='\n'.join(lines), filename='nodes.csv')
+            return n['id'], n.get('type', ''), hop, hop_label(hop), n.get('connections', '')
+
+        w.writerows(map(node_row, nodes))
+        return dict(content=buf.getvalue(), filename='nodes.csv')
 
     elif fmt == 'csv-edges':
-        lines = ['source,target']
-        for l in links:
-            lines.append(f"{l['source']},{l['target']}")
-        return dict(content='\n'.join(lines), filename='edges.csv')
+        buf = io.StringIO()
+        w = csv.writer(buf, lineterminator='\n')
+        w.writerow(['source', 'target'])
+        w.writerows((l['source'], l['target']) for l in links)
+        return dict(content=buf.getvalue(), filename='edges.csv')
 
     elif fmt == 'gexf':
-        root = ET.Element('gexf', xmlns='http://www.gexf.net/1.2draft', version='1.2')
-        graph_el = ET.SubElement(root, 'graph', defaultedgetype='directed')
+        # Stream elements straight into the buffer rather than building an
+        # ElementTree first, so large graphs don't materialize a DOM
+        buf = io.StringIO()
+        w = XMLGenerator(buf, encoding='utf-8', short_empty_elements=True)
+
+        def empty(name, attrs):
+            w.startElement(name, attrs)
+            w.endElement(name)
+
+        w.startDocument()
+        w.startElement('gexf', {'xmlns': 'http://www.gexf.net/1.2draft', 'version': '1.2'})
+        w.startElement('graph', {'defaultedgetype': 'directed'})
 
-        attrs = ET.SubElement(graph_el, 'attributes', {'class': 'node'})
-        ET.SubElement(attrs, 'attribute', id='0', title='type', type='string')
-        ET.SubElement(attrs, 'attribute', id='1', title='hop', type='integer')
-        ET.SubElement(attrs, 'attribute', id='2', title='connections', type='integer')
-        ET.SubElement(attrs, 'attribute', id='3', title='hop_label', type='string')
+        w.startElement('attributes', {'class': 'node'})
+        empty('attribute', {'id': '0', 'title': 'type', 'type': 'string'})
+        empty('attribute', {'id': '1', 'title': 'hop', 'type': 'integer'})
+        empty('attribute', {'id': '2', 'title': 'connections', 'type': 'integer'})
+        empty('attribute', {'id': '3', 'title': 'hop_label', 'type': 'string'})
+        w.endElement('attributes')
 
-        nodes_el = ET.SubElement(graph_el, 'nodes')
+        w.startElement('nodes', {})
         for n in nodes:
             hop = n.get('hop', 0)
-            node_el = ET.SubElement(nodes_el, 'node', id=n['id'], label=n.get('label', n['id']))
-            av = ET.SubElement(node_el, 'attvalues')
-            ET.SubElement(av, 'attvalue', {'for': '0', 'value': str(n.get('type', ''))})
-            ET.SubElement(av, 'attvalue', {'for': '1', 'value': str(hop)})
-            ET.SubElement(av, 'attvalue', {'for': '2', 'value': str(n.get('connections', ''))})
-            ET.SubElement(av, 'attvalue', {'for': '3', 'value': hop_label(hop)})
-
-        edges_el = ET.SubElement(graph_el, 'edges')
+            w.startElement('node', {'id': n['id'], 'label': n.get('label', n['id'])})
+            w.startElement('attvalues', {})
+            empty('attvalue', {'for': '0', 'value': str(n.get('type', ''))})
+            empty('attvalue', {'for': '1', 'value': str(hop)})
+            empty('attvalue', {'for': '2', 'value': str(n.get('connections', ''))})
+            empty('attvalue', {'for': '3', 'value': hop_label(hop)})
+            w.endElement('attvalues')
+            w.endElement('node')
+        w.endElement('nodes')
+
+        w.startElement('edges', {})
         for i, l in enumerate(links):
-            ET.SubElement(edges_el, 'edge', id=str(i), source=l['source'], target=l['target'])
+            empty('edge', {'id': str(i), 'source': l['source'], 'target': l['target']})
+        w.endElement('edges')
 
-        buf = io.StringIO()
-        tree = ET.ElementTree(root)
-        tree.write(buf, encoding='unicode', xml_declaration=True)
+        w.endElement('graph')
+        w.endElement('gexf')
+        w.endDocument()
         return dict(content=buf.getvalue(), filename='graph.gexf')
 
     raise PreventUpdate
@@ -1352,86 +1734,22 @@ def confirm_example_load(submit_clicks, pending):
      Output('hidden-hops', 'data', allow_duplicate=True),
      Output('hop-colors', 'data', allow_duplicate=True)],
     Input('example-loading', 'data'),
+    State('session-id', 'data'),
     prevent_initial_call=True
 )
-def load_example_graph(example_type):
-    if not example_type:
+def load_example_graph(example_type, session_id):
+    if not example_type or example_type not in pickle_files:
         raise PreventUpdate
 
-    pickle_file = pickle_files.get(example_type)
-    if not pickle_file:
-        raise PreventUpdate
-
-    pickle_path = PICKLE_DIR / pickle_file
-
     try:
-        # Load precomputed graph from pickle
-        with open(pickle_path, 'rb') as f:
-            G = pickle.load(f)
-
-        # Prune isolates (nodes with no edges) before converting
-        isolates = list(nx.isolates(G))
-        G.remove_nodes_from(isolates)
-
-        # Build node_type → hop mapping from all distinct node types.
-        type_to_hop = {}
-        legend_labels = {}
-        next_hop = 0
-        for _, data in G.nodes(data=True):
-            ntype = data.get('node_type', 'seed' if data.get('is_seed') else 'discovered')
-            if ntype not in type_to_hop:
-                type_to_hop[ntype] = next_hop
-                legend_labels[str(next_hop)] = ntype
-                next_hop += 1
-
-        # Calculate in-degree and out-degree for connection counts
-        in_degree = dict(G.in_degree())
-        out_degree = dict(G.out_degree())
-
-        # Convert NetworkX to nodes/links
-        nodes = []
-        links = []
-
-        for node, data in G.nodes(data=True):
-            node_type = data.get('node_type', 'seed' if data.get('is_seed') else 'discovered')
-
-            if 'total_connections' in data:
-                connections = data['total_connections']
-            elif 'connections' in data:
-                connections = data['connections']
-            elif data.get('is_seed'):
-                connections = in_degree.get(node, 0)
-            else:
-                connections = out_degree.get(node, 0)
-
-            node_hop = type_to_hop.get(node_type, 0)
-
-            nodes.append({
-                'id': node,
-                'label': node,
-                'type': node_type,
-                'hop': node_hop,
-                'connections': connections,
-            })
-
-        for src, tgt, _ in G.edges(data=True):
-            links.append({'source': src, 'target': tgt})
-
-        # Compute default hidden hops from per-example config
-        default_hidden_labels = {
-            s.lower() for s in EXAMPLE_DEFAULT_HIDDEN_LABELS.get(example_type, set())
-        }
-        initial_hidden_hops = [
-            hop for ntype, hop in type_to_hop.items()
-            if ntype.lower() in default_hidden_labels
-        ]
-
-        return nodes, links, legend_labels, initial_hidden_hops, {}
-
+        nodes, links, legend_labels, initial_hidden_hops = get_example_graph(example_type)
     except Exception as e:
-        print(f"Error loading example from {pickle_path}: {e}")
+        print(f"Error loading example {example_type}: {e}")
         raise PreventUpdate
 
+    drop_graph_index(session_id)
+    return nodes, links, dict(legend_labels), list(initial_hidden_hops), {}
+
 
 # Clientside callback to set graph dimensions
 app.clientside_callback(
@@ -1456,18 +1774,17 @@ server = app.server
 
 
 # Serve app for example URL paths (enables direct URL navigation)
-@server.route('/news-credibility-network')
-@server.route('/pravda-network')
-@server.route('/link-spam-network')
-@server.route('/iranian-news-network')
-@server.route('/think-tanks-network')
-@server.route('/high-profile-news-network')
-@server.route('/dotnews-network')
 def serve_example_routes():
     return app.index()
 
 
+for _path in EXAMPLE_MAP:
+    server.add_url_rule(_path, endpoint=f'example:{_path}', view_func=serve_example_routes)
+
+
 if __name__ == '__main__':
+    if os.environ.get('WEBGRAPH_WARMUP', '1') != '0':
+        threading.Thread(target=warm_up, name='warm-up', daemon=True).start()
     port = int(os.environ.get('PORT', 8050))
     # use_reloader=False prevents double webgraph loading in debug mode
     app.run(debug=False, use_reloader=False, host='0.0.0.0', port=port) #, dev_tools_ui=False, dev_tools_props_check=False)
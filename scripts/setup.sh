@@ -147,7 +147,7 @@ else
     echo "   ✅ cc-webgraph already built"
 fi
 
-# Setup NetNeighbors and compile DiscoveryTool
+# Setup NetNeighbors and compile the Java tools
 echo ""
 echo "5. Setting up NetNeighbors..."
 
@@ -158,28 +158,30 @@ if [ ! -d "$BASE_DIR/NetNeighbors" ] && [ "$NETNEIGHBORS_DIR" != "$BASE_DIR/NetN
     NETNEIGHBORS_DIR="$BASE_DIR/NetNeighbors"
 fi
 
-# Compile DiscoveryTool if missing or source is newer
-DISCOVERY_CLASS="$NETNEIGHBORS_DIR/bin/DiscoveryTool.class"
-DISCOVERY_SRC="$NETNEIGHBORS_DIR/src/DiscoveryTool.java"
-
-NEEDS_COMPILE=false
-if [ ! -f "$DISCOVERY_CLASS" ]; then
-    NEEDS_COMPILE=true
-elif [ "$DISCOVERY_SRC" -nt "$DISCOVERY_CLASS" ]; then
-    echo "   Source file updated, recompiling..."
-    NEEDS_COMPILE=true
-fi
+# Compile the Java tools if missing or source is newer
+for TOOL in DiscoveryTool BuildOffsets; do
+    TOOL_CLASS="$NETNEIGHBORS_DIR/bin/$TOOL.class"
+    TOOL_SRC="$NETNEIGHBORS_DIR/src/$TOOL.java"
+
+    NEEDS_COMPILE=false
+    if [ ! -f "$TOOL_CLASS" ]; then
+        NEEDS_COMPILE=true
+    elif [ "$TOOL_SRC" -nt "$TOOL_CLASS" ]; then
+        echo "   $TOOL source updated, recompiling..."
+        NEEDS_COMPILE=true
+    fi
 
-if [ "$NEEDS_COMPILE" = true ]; then
-    echo "   Compiling DiscoveryTool..."
-    mkdir -p "$NETNEIGHBORS_DIR/bin"
-    javac -cp "$CC_WEBGRAPH_JAR" \
-        -d "$NETNEIGHBORS_DIR/bin" \
-        "$NETNEIGHBORS_DIR/src/DiscoveryTool.java"
-    echo "   ✅ DiscoveryTool compiled"
-else
-    echo "   ✅ DiscoveryTool already compiled"
-fi
+    if [ "$NEEDS_COMPILE" = true ]; then
+        echo "   Compiling $TOOL..."
+        mkdir -p "$NETNEIGHBORS_DIR/bin"
+        javac -cp "$CC_WEBGRAPH_JAR" \
+            -d "$NETNEIGHBORS_DIR/bin" \
+            "$TOOL_SRC"
+        echo "   ✅ $TOOL compiled"
+    else
+        echo "   ✅ $TOOL already compiled"
+    fi
+done
 
 echo ""
 echo "============================================================"
@@ -188,4 +190,5 @@ echo "============================================================"
 echo ""
 echo "Next steps:"
 echo "  1. Download webgraph data (use utils.download_webgraph)"
-echo "  2. Run verify.sh to confirm installation"
+echo "  2. Build missing graph offsets: java -cp \"$CC_WEBGRAPH_JAR:$NETNEIGHBORS_DIR/bin\" BuildOffsets <graph-base> <graph-base>-t"
+echo "  3. Run verify.sh to confirm installation"
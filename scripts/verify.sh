@@ -88,6 +88,12 @@ check_file "${VERSION}-domain-t.properties" "Transpose graph properties"
 check_file "${VERSION}-domain-t.offsets" "Transpose graph offsets"
 check_file "${VERSION}-domain.stats" "Graph statistics"
 
+if [ ! -f "${WEBGRAPH_DIR}/${VERSION}-domain.offsets" ] || [ ! -f "${WEBGRAPH_DIR}/${VERSION}-domain-t.offsets" ]; then
+    echo "   Build missing offsets with:"
+    echo "     java -cp \"$JAR_PATH:$NETNEIGHBORS_DIR/bin\" BuildOffsets \\"
+    echo "       ${WEBGRAPH_DIR}/${VERSION}-domain ${WEBGRAPH_DIR}/${VERSION}-domain-t"
+fi
+
 # Read stats file if available
 echo ""
 echo "5. Graph Statistics:"
@@ -0,0 +1,33 @@
+import it.unimi.dsi.webgraph.BVGraph;
+import java.nio.file.*;
+
+/**
+ * Generate missing BVGraph .offsets files for one or more graphs.
+ *
+ * Running every graph (e.g. the forward and transpose graph) through one
+ * JVM avoids paying JVM startup once per graph, as separate
+ * `java it.unimi.dsi.webgraph.BVGraph -O` runs would. Graphs that already
+ * have an .offsets file are skipped.
+ *
+ * Usage:
+ *   java -cp "cc-webgraph.jar:bin" BuildOffsets \
+ *       /path/to/graph-base /path/to/graph-base-t
+ */
+public class BuildOffsets {
+
+    public static void main(String[] args) throws Exception {
+        if (args.length == 0 || args[0].equals("--help")) {
+            System.out.println("Usage: java BuildOffsets <graph-base> [<graph-base> ...]");
+            return;
+        }
+
+        for (String basename : args) {
+            if (Files.exists(Path.of(basename + ".offsets"))) {
+                System.out.println("Offsets present: " + basename);
+                continue;
+            }
+            System.out.println("Building offsets: " + basename);
+            BVGraph.main(new String[] {"-O", basename});
+        }
+    }
+}
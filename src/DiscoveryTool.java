@@ -1,6 +1,7 @@
 import it.unimi.dsi.webgraph.*;
 import it.unimi.dsi.fastutil.ints.*;
 import java.io.*;
+import java.nio.charset.StandardCharsets;
 import java.util.*;
 import java.util.zip.*;
 
@@ -21,9 +22,15 @@ import java.util.zip.*;
  *       --output /path/to/results.csv \
  *       --min-connections 5 \
  *       --direction backlinks
+ *
+ * Pass "--seeds -" to read the seed domains from stdin instead of a file.
  */
 public class DiscoveryTool {
 
+    // Buffer size for file IO: the gzipped vertices file (both for the compressed
+    // input and the decoded text; JDK defaults are 512 bytes and 8 KiB) and the results CSV
+    private static final int IO_BUFFER_SIZE = 128 * 1024;
+
     public static void main(String[] args) throws Exception {
         // Parse command line arguments
         String graphBase = null;
@@ -82,7 +89,7 @@ public class DiscoveryTool {
         System.out.println("Required options:");
         System.out.println("  --graph <path>          Base path to graph files (without .graph extension)");
         System.out.println("  --vertices <path>       Path to vertices file (gzipped)");
-        System.out.println("  --seeds <path>          Path to seeds file (one domain per line)");
+        System.out.println("  --seeds <path>          Path to seeds file (one domain per line), '-' for stdin");
         System.out.println("  --output <path>         Path to output CSV file");
         System.out.println();
         System.out.println("Optional:");
@@ -108,7 +115,10 @@ public class DiscoveryTool {
         // Load seed domains into a Set for fast lookup
         System.out.println("Loading seed domains...");
         Set<String> seedDomains = new HashSet<>();
-        try (BufferedReader br = new BufferedReader(new FileReader(seedsFile))) {
+        Reader seedsReader = seedsFile.equals("-")
+            ? new InputStreamReader(System.in, StandardCharsets.UTF_8)
+            : new FileReader(seedsFile, StandardCharsets.UTF_8);
+        try (BufferedReader br = new BufferedReader(seedsReader)) {
             String line;
             while ((line = br.readLine()) != null) {
                 String domain = line.trim().toLowerCase();
@@ -119,6 +129,13 @@ public class DiscoveryTool {
         }
         System.out.println("Loaded " + seedDomains.size() + " seed domains");
 
+        // The vertices file stores domains reversed (com.example.www): reverse
+        // the few seeds once instead of every one of the 100M+ vertex lines
+        Map<String, String> seedsByRevDomain = new HashMap<>();
+        for (String domain : seedDomains) {
+            seedsByRevDomain.put(reverseDomain(domain), domain);
+        }
+
         // PASS 1: Find IDs for seed domains only (memory efficient)
         System.out.println("\nMapping seed domains to graph IDs...");
         long startTime = System.currentTimeMillis();
@@ -126,25 +143,22 @@ public class DiscoveryTool {
         IntOpenHashSet seedIds = new IntOpenHashSet();
         int foundCount = 0;
 
-        try (BufferedReader br = new BufferedReader(
-                new InputStreamReader(
-                    new GZIPInputStream(
-                        new FileInputStream(verticesFile))))) {
+        try (BufferedReader br = openVertices(verticesFile)) {
             String line;
             while ((line = br.readLine()) != null) {
-                String[] parts = line.split("\t");
-                if (parts.length >= 2) {
-                    int id = Integer.parseInt(parts[0]);
-                    String revDomain = parts[1];
-                    String domain = reverseDomain(revDomain);
-
-                    if (seedDomains.contains(domain)) {
-                        seedIds.add(id);
-                        seedIdToDomain.put(id, domain);
-                        foundCount++;
-                        if (foundCount == seedDomains.size()) {
-                            break; // Found all seeds, stop scanning
-                        }
+                // Slice the name column out directly (no split() array) and
+                // parse the id only for the rare lines that match a seed
+                int tab = line.indexOf('\t');
+                if (tab < 0) continue;
+                String domain = seedsByRevDomain.get(nameColumn(line, tab));
+
+                if (domain != null) {
+                    int id = Integer.parseInt(line, 0, tab, 10);
+                    seedIds.add(id);
+                    seedIdToDomain.put(id, domain);
+                    foundCount++;
+                    if (foundCount == seedDomains.size()) {
+                        break; // Found all seeds, stop scanning
                     }
                 }
             }
@@ -172,28 +186,39 @@ public class DiscoveryTool {
         // Run discovery
         System.out.println("\nRunning discovery (" + direction + ")...");
         startTime = System.currentTimeMillis();
-        Int2IntOpenHashMap candidateCounts = new Int2IntOpenHashMap();
-        candidateCounts.defaultReturnValue(0);
+        // Dense per-node counters (4 bytes per graph node): a plain array
+        // increment per edge instead of a hash probe
+        int[] candidateCounts = new int[graph.numNodes()];
+
+        // Visit all seeds in one batch, in ascending id order, so the
+        // memory-mapped graph is read front to back rather than at random
+        int[] sortedSeedIds = seedIds.toIntArray();
+        Arrays.sort(sortedSeedIds);
 
         int processed = 0;
-        for (int seedId : seedIds) {
+        for (int seedId : sortedSeedIds) {
             LazyIntIterator neighbors = graph.successors(seedId);
             int neighbor;
             while ((neighbor = neighbors.nextInt()) != -1) {
-                if (!seedIds.contains(neighbor)) {
-                    candidateCounts.addTo(neighbor, 1);
-                }
+                candidateCounts[neighbor]++;
             }
 
             processed++;
             if (processed % 100 == 0 || processed == seedIds.size()) {
                 System.out.print("\rProcessed " + processed + "/" + seedIds.size() + " seeds...");
+                // print() without a newline is not auto-flushed, so a reader
+                // on a pipe would see progress lagging behind
+                System.out.flush();
             }
         }
         System.out.println();
 
+        // Seeds are not candidates: clear them once rather than testing every neighbor
+        for (int seedId : sortedSeedIds) {
+            candidateCounts[seedId] = 0;
+        }
+
         long discoveryTime = System.currentTimeMillis() - startTime;
-        System.out.println("Found " + String.format("%,d", candidateCounts.size()) + " unique candidate domains");
         System.out.println("Discovery time: " + (discoveryTime / 1000.0) + " seconds");
         printMemoryUsage("After discovery");
 
@@ -201,14 +226,19 @@ public class DiscoveryTool {
         System.out.println("\nFiltering by threshold >= " + minConnections + "...");
         IntArrayList resultIds = new IntArrayList();
         IntArrayList resultCounts = new IntArrayList();
-
-        for (Int2IntMap.Entry entry : candidateCounts.int2IntEntrySet()) {
-            if (entry.getIntValue() >= minConnections) {
-                resultIds.add(entry.getIntKey());
-                resultCounts.add(entry.getIntValue());
+        int uniqueCandidates = 0;
+
+        for (int id = 0; id < candidateCounts.length; id++) {
+            int count = candidateCounts[id];
+            if (count == 0) continue;
+            uniqueCandidates++;
+            if (count >= minConnections) {
+                resultIds.add(id);
+                resultCounts.add(count);
             }
         }
 
+        System.out.println("Found " + String.format("%,d", uniqueCandidates) + " unique candidate domains");
         System.out.println("Found " + String.format("%,d", resultIds.size()) + " domains meeting threshold");
 
         // Free memory before second pass
@@ -223,23 +253,18 @@ public class DiscoveryTool {
         IntSet resultIdSet = new IntOpenHashSet(resultIds);
         Int2ObjectOpenHashMap<String> resultIdToDomain = new Int2ObjectOpenHashMap<>();
 
-        try (BufferedReader br = new BufferedReader(
-                new InputStreamReader(
-                    new GZIPInputStream(
-                        new FileInputStream(verticesFile))))) {
+        try (BufferedReader br = openVertices(verticesFile)) {
             String line;
             while ((line = br.readLine()) != null) {
-                String[] parts = line.split("\t");
-                if (parts.length >= 2) {
-                    int id = Integer.parseInt(parts[0]);
-                    if (resultIdSet.contains(id)) {
-                        String revDomain = parts[1];
-                        String domain = reverseDomain(revDomain);
-                        resultIdToDomain.put(id, domain);
-
-                        if (resultIdToDomain.size() == resultIds.size()) {
-                            break; // Found all results
-                        }
+                int tab = line.indexOf('\t');
+                if (tab < 0) continue;
+                int id = Integer.parseInt(line, 0, tab, 10);
+                if (resultIdSet.contains(id)) {
+                    String domain = reverseDomain(nameColumn(line, tab));
+                    resultIdToDomain.put(id, domain);
+
+                    if (resultIdToDomain.size() == resultIds.size()) {
+                        break; // Found all results
                     }
                 }
             }
@@ -248,16 +273,23 @@ public class DiscoveryTool {
         scanTime = System.currentTimeMillis() - startTime;
         System.out.println("Lookup time: " + (scanTime / 1000.0) + " seconds");
 
-        // Sort results by connection count descending
-        Integer[] indices = new Integer[resultIds.size()];
-        for (int i = 0; i < indices.length; i++) indices[i] = i;
-        Arrays.sort(indices, (a, b) -> resultCounts.getInt(b) - resultCounts.getInt(a));
+        // Sort results by connection count descending (ties in id order).
+        // Keys pack (-count, index) into one long so a primitive sort does it,
+        // with no boxed indices or comparator calls.
+        long[] order = new long[resultIds.size()];
+        for (int i = 0; i < order.length; i++) {
+            order[i] = ((long) -resultCounts.getInt(i) << 32) | i;
+        }
+        Arrays.sort(order);
 
         // Write results to CSV
         System.out.println("\nWriting results to " + outputFile + "...");
-        try (PrintWriter pw = new PrintWriter(new FileWriter(outputFile))) {
+        // One large buffer, so rows reach the file in a few big writes
+        try (PrintWriter pw = new PrintWriter(new BufferedWriter(
+                new FileWriter(outputFile, StandardCharsets.UTF_8), IO_BUFFER_SIZE))) {
             pw.println("domain,connections,percentage");
-            for (int idx : indices) {
+            for (long key : order) {
+                int idx = (int) key;
                 int id = resultIds.getInt(idx);
                 int connections = resultCounts.getInt(idx);
                 String domain = resultIdToDomain.get(id);
@@ -276,6 +308,26 @@ public class DiscoveryTool {
         System.out.println("=".repeat(60));
     }
 
+    /**
+     * Open the gzipped vertices file for line-by-line reading with large buffers
+     */
+    private static BufferedReader openVertices(String verticesFile) throws IOException {
+        return new BufferedReader(
+            new InputStreamReader(
+                new GZIPInputStream(new FileInputStream(verticesFile), IO_BUFFER_SIZE),
+                StandardCharsets.UTF_8),
+            IO_BUFFER_SIZE);
+    }
+
+    /**
+     * Second column of a vertices line (the reversed domain name), given the
+     * index of the first tab
+     */
+    private static String nameColumn(String line, int tab) {
+        int end = line.indexOf('\t', tab + 1);
+        return line.substring(tab + 1, end < 0 ? line.length() : end);
+    }
+
     /**
      * Convert reversed domain notation (com.example.www) to normal (www.example.com)
      */